@@ -0,0 +1,77 @@
+# Author: Jedi Lee
+# Student ID: 012594297
+
+from typing import Any, List, Optional, Tuple
+
+# Selection kernels for the router. They read candidate tuples and one matrix row only (no
+# tables or matrix objects), so the hot scan stays a self-contained loop.
+
+# (load position, node, corrected node or None, available_time, correction_time or None,
+#  deadline or None, package)
+Candidate = Tuple[int, int, Optional[int], int, Optional[int], Optional[int], Any]
+
+def pick_next(
+    clock: int,
+    row: List[float],
+    cand: List[Candidate],
+    secs_per_mile: float,
+    urgency_s: int,
+) -> Tuple[int, float]:
+    """
+    Single pass over cand tracking the best urgent, on-time and any available stop.
+    Returns (index, miles) of the winner, or (-1, 0.0) if none is available. Travel is
+    round(miles * secs_per_mile) whole seconds, so the deadline and slack (<= urgency_s
+    counts as urgent) checks are int arithmetic.
+    """
+    inf = float("inf")
+    urgent_i, urgent_dist = -1, inf
+    best_on_i, best_on_dist = -1, inf
+    best_any_i, best_any_dist = -1, inf
+
+    for i, (_, node, corr_node, avail, corr_time, deadline, _) in enumerate(cand):
+        if clock < avail:
+            continue
+        if corr_node is not None and clock >= corr_time:
+            node = corr_node
+
+        d = row[node]
+        if d < best_any_dist:
+            best_any_i, best_any_dist = i, d
+
+        if deadline is None:
+            if d < best_on_dist:
+                best_on_i, best_on_dist = i, d
+            continue
+        arrival = clock + round(d * secs_per_mile)
+        if arrival <= deadline:
+            if d < best_on_dist:
+                best_on_i, best_on_dist = i, d
+            if deadline - arrival <= urgency_s and d < urgent_dist:
+                urgent_i, urgent_dist = i, d
+
+    if urgent_i >= 0:
+        return urgent_i, urgent_dist
+    if best_on_i >= 0:
+        return best_on_i, best_on_dist
+    if best_any_i >= 0:
+        return best_any_i, best_any_dist
+    return -1, 0.0
+
+def pick_nearest(clock: int, row: List[float], cand: List[Candidate]) -> Tuple[int, float]:
+    """
+    pick_next() for candidates without deadlines: every available stop is on time and none
+    is urgent, so the winner is simply the nearest available one (first one wins ties).
+    Returns (index, miles), or (-1, 0.0) if none is available.
+    """
+    best_i, best_dist = -1, float("inf")
+    for i, (_, node, corr_node, avail, corr_time, _, _) in enumerate(cand):
+        if clock < avail:
+            continue
+        if corr_node is not None and clock >= corr_time:
+            node = corr_node
+        d = row[node]
+        if d < best_dist:
+            best_i, best_dist = i, d
+    if best_i >= 0:
+        return best_i, best_dist
+    return -1, 0.0
@@ -2,7 +2,9 @@
 # Student ID: 012594297
 
 import csv
-from typing import Dict, List
+import sys
+from array import array
+from typing import Dict, List, Optional, Sequence
 
 class AddressIndex:
     """
@@ -14,19 +16,27 @@ class AddressIndex:
       - node_for(): get ID for an address
       - address_for(): get address for an ID
     """
+    __slots__ = ("addr_to_node", "node_to_addr")
+
     def __init__(self) -> None:
         self.addr_to_node: Dict[str, int] = {}
         self.node_to_addr: List[str] = []
 
     @staticmethod
     def _normalize(addr: str) -> str:
-        # Normalization for consistent keys
-        return addr.strip()
+        # Normalization for consistent keys. Interned, so a lookup with an equal address
+        # finds the very same key object and dict probing stops at the identity check;
+        # str caches its own hash, so each address is hashed only once.
+        return sys.intern(addr.strip())
 
     def load(self, path: str) -> None:
         # Parse CSV rows and populate both maps. Non-numeric row[0] are headers and are skipped.
-        rows = list(csv.reader(open(path, newline="")))
-        for row in rows:
+        # One buffered read and decode; csv only runs over the lines (quoted names allowed).
+        with open(path, "rb") as f:
+            lines = f.read().decode().splitlines()
+        for row in csv.reader(lines):
+            if not row:
+                continue
             try:
                 node = int(row[0])
             except ValueError:
@@ -46,41 +56,95 @@ class AddressIndex:
         return self.node_to_addr[node]
 
 
+def _cell(row: List[bytes], j: int) -> float:
+    # Miles in column j of one split CSV row; blank or missing cells read as 0.0
+    c = row[j].strip() if j < len(row) else b""
+    return float(c) if c else 0.0
+
+
 class DistanceMatrix:
     """
-    Stores a fully symmetric miles matrix.
+    Stores a fully symmetric miles matrix as its packed lower triangle (diagonal included).
+    Cells stay 8-byte doubles: the CSV miles are decimal tenths that float32 cannot hold
+    exactly, so a narrower array would drift the reported mileage totals.
 
     Process/Flow:
-      - load(): build a square matrix of floats, copy lower triangle to upper
-      - get(): return miles by node IDs
-      - distance_between_addresses(): convenience wrapper using AddressIndex
+      - load(): parse the lower-triangle CSV into a flat array('d') of n(n+1)/2 cells
+      - generation: bumped by every load(), so callers can tell a reloaded matrix apart
+      - get(): return miles by node IDs (row offset of max(i, j) plus min(i, j))
+      - row(): every distance out of one node, gathered from the triangle; cached per node
+      - get_many(): miles for paired sequences of node IDs in one call
+      - nearest(): closest candidate node to a given node
+      - distance_between_addresses(): compatibility wrapper using AddressIndex
     """
+    __slots__ = ("_n", "_tri", "_row_off", "_rows", "_gen")
+
     def __init__(self) -> None:
-        self._miles: List[List[float]] = []
+        self._n: int = 0
+        self._tri: array = array("d")
+        self._row_off: List[int] = []
+        # Lazily gathered rows: the router re-reads the same few rows at every stop
+        self._rows: List[Optional[List[float]]] = []
+        self._gen: int = 0
 
     def load(self, path: str) -> None:
-        rows = list(csv.reader(open(path, newline="")))
+        # The miles file is bare numbers and blanks (no quoting), so one read plus a
+        # split per line replaces the csv module's per-character state machine
+        with open(path, "rb") as f:
+            rows = [line.split(b",") for line in f.read().splitlines() if line.strip()]
         n = len(rows)
-        self._miles = [[0.0 for _ in range(n)] for _ in range(n)]
-
-        # Fill whatever the CSV has
-        for i in range(n):
-            for j in range(len(rows[i])):
-                cell = rows[i][j].strip()
-                if cell:
-                    self._miles[i][j] = float(cell)
-
-        # Mirror to ensure symmetry and zero diagonal
-        for i in range(n):
-            for j in range(n):
-                if i == j:
-                    self._miles[i][j] = 0.0
-                elif self._miles[i][j] == 0.0 and self._miles[j][i] != 0.0:
-                    self._miles[i][j] = self._miles[j][i]
+
+        # Pack j <= i straight from the split rows. A blank lower cell falls back to
+        # its upper mirror, and the diagonal is forced to zero, so no dense grid or
+        # separate symmetry pass is needed.
+        self._n = n
+        self._row_off = [i * (i + 1) // 2 for i in range(n)]
+        tri = self._tri = array("d")
+        for i, row in enumerate(rows):
+            for j in range(i):
+                v = _cell(row, j)
+                tri.append(v if v != 0.0 else _cell(rows[j], i))
+            tri.append(0.0)
+        self._rows = [None] * n
+        self._gen += 1
+
+    @property
+    def generation(self) -> int:
+        return self._gen
 
     def get(self, i: int, j: int) -> float:
-        return self._miles[i][j]
+        # (i, j) and (j, i) share one cell of the lower triangle
+        if j > i:
+            i, j = j, i
+        return self._tri[self._row_off[i] + j]
+
+    def row(self, i: int) -> List[float]:
+        # row(i)[j] == get(i, j). Gathered once per node and then shared, so callers must
+        # treat the list as read-only.
+        cached = self._rows[i]
+        if cached is None:
+            cached = self._rows[i] = self._gather_row(i)
+        return cached
+
+    def _gather_row(self, i: int) -> List[float]:
+        # The contiguous run tri[i, 0..i], then column i below the diagonal
+        tri, off = self._tri, self._row_off
+        start = off[i]
+        return tri[start:start + i + 1].tolist() + [tri[off[j] + i] for j in range(i + 1, self._n)]
+
+    def get_many(self, i: Sequence[int], j: Sequence[int]) -> List[float]:
+        # Batch lookup for paired node IDs; avoids a Python method call per pair
+        tri, off = self._tri, self._row_off
+        return [tri[off[a] + b] if a >= b else tri[off[b] + a] for a, b in zip(i, j)]
+
+    def nearest(self, current: int, candidates: Sequence[int]) -> int:
+        # Closest candidate node (first one wins ties); -1 when there are no candidates.
+        # min() with a C-level key keeps the whole scan out of the bytecode loop.
+        if not candidates:
+            return -1
+        return min(candidates, key=self.row(current).__getitem__)
 
     def distance_between_addresses(self, a: str, b: str, index: AddressIndex) -> float:
-        # Convert both addresses to nodes, then fetch miles in O(1)
+        # Compatibility shim for string callers: two index lookups, then get(). The router
+        # works on node IDs and row() instead and never calls this.
         return self.get(index.node_for(a), index.node_for(b))
@@ -1,63 +1,121 @@
 # Author: Jedi Lee
 # Student ID: 012594297
 
-from typing import Any, Iterable, List, Optional, Tuple
+from typing import Any, Iterable, List, Optional, Tuple, Union
 
-class ChainingHashTable:
+# Marks a never-used slot; a private object so any key value (including None or -1) is legal
+_EMPTY = object()
+
+
+class _TableReport:
+    """Console report shared by the package tables; relies only on items()."""
+
+    __slots__ = ()
+
+    def print_table(self):
+        rows = []
+        for key, value in self.items():
+            rows.append([
+                str(key),
+                f"{value.street}, {value.city}, {value.state} {value.zip}",
+                str(value.deadline),
+                str(value.weight),
+                str(value.status),
+                str(value.delivery_time)
+            ])
+        header = ["Package ID", "Address", "Deadline", "Weight", "Status", "Delivery Time"]
+        # Single pass for column widths, then one precomputed format spec for every line
+        col_widths = [len(h) for h in header]
+        for row in rows:
+            for i, cell in enumerate(row):
+                if len(cell) > col_widths[i]:
+                    col_widths[i] = len(cell)
+        fmt = "  ".join(f"{{:<{w}}}" for w in col_widths)
+        print(fmt.format(*header))
+        print("-" * (sum(col_widths) + 10))
+        for row in rows:
+            print(fmt.format(*row))
+
+
+class HashTable(_TableReport):
     """
-    - Separate-chaining hash table for package storage: key=Package ID, value=Package object.
+    - Open-addressing hash table for package storage: key=Package ID, value=Package object.
     - O(1) average insert/search/remove; supports frequent status updates in real time.
-    - Chaining gracefully handles collisions via per-bucket lists.
+    - Linear probing over two parallel slot arrays (keys, values). Capacity is always a
+      power of two, so a key's home slot is hash(key) & (capacity - 1).
 
-    - insert(): place/update (key,value) in bucket; resize when load factor exceeded
+    - insert(): place/update (key,value) in its probe run; resize when load factor exceeded
     - search(): return value for key or None
-    - remove(): delete key if present
+    - remove(): delete key if present (backward-shift, so no tombstones)
     - items(): iterate all pairs
+    - sorted_items(): pairs in key order, cached until the next insert/remove
     - print_table(): pretty-prints core package fields for screenshots
     """
 
-    __slots__ = ("_buckets", "_size", "_max_load_factor")
+    __slots__ = ("_keys", "_vals", "_size", "_max_load_factor", "_cap", "_mask", "_sorted")
 
     def __init__(self, init_capacity: int = 64, max_load_factor: float = 0.75) -> None:
         if init_capacity < 1:
             raise ValueError("init_capacity must be >= 1")
-        self._buckets: List[List[Tuple[Any, Any]]] = [[] for _ in range(init_capacity)]
+        if not 0.0 < max_load_factor < 1.0:
+            raise ValueError("max_load_factor must be in (0, 1)")
+        capacity = 1 << (init_capacity - 1).bit_length()
+        self._keys: List[Any] = [_EMPTY] * capacity
+        self._vals: List[Any] = [None] * capacity
         self._size: int = 0
         self._max_load_factor: float = max_load_factor
+        # Cached so the hot paths never call len() or divide
+        self._cap: int = capacity
+        self._mask: int = capacity - 1
+        self._sorted: Optional[Tuple[Tuple[Any, Any], ...]] = None
 
     def insert(self, key: Any, value: Any) -> None:
         """Insert or update a (key, value) pair; doubles capacity when load factor exceeds threshold."""
-        idx = self._index(key)
-        bucket = self._buckets[idx]
+        self._sorted = None
+        keys = self._keys
+        mask = self._mask
+        idx = hash(key) & mask
 
-        for i, (k, _) in enumerate(bucket):
-            if k == key:
-                bucket[i] = (key, value)
+        while keys[idx] is not _EMPTY:
+            if keys[idx] == key:
+                self._vals[idx] = value
                 return
+            idx = (idx + 1) & mask
 
-        bucket.append((key, value))
+        keys[idx] = key
+        self._vals[idx] = value
         self._size += 1
         if self.load_factor() > self._max_load_factor:
-            self._resize(len(self._buckets) * 2)
+            self._resize(self._cap * 2)
 
     def search(self, key: Any) -> Optional[Any]:
         """Return value for key, or None if absent."""
-        bucket = self._buckets[self._index(key)]
-        for k, v in bucket:
-            if k == key:
-                return v
-        return None
+        idx = self._find(key)
+        return None if idx < 0 else self._vals[idx]
 
     def remove(self, key: Any) -> bool:
         """Remove key from table. Returns True if removed, False if not found."""
-        idx = self._index(key)
-        bucket = self._buckets[idx]
-        for i, (k, _) in enumerate(bucket):
-            if k == key:
-                bucket.pop(i)
-                self._size -= 1
-                return True
-        return False
+        hole = self._find(key)
+        if hole < 0:
+            return False
+        self._sorted = None
+
+        # Backward-shift deletion: pull later members of the probe run into the gap so
+        # that search() never stops early at a hole left inside a run
+        keys, vals = self._keys, self._vals
+        mask = self._mask
+        j = (hole + 1) & mask
+        while keys[j] is not _EMPTY:
+            home = hash(keys[j]) & mask
+            if (j - home) & mask >= (j - hole) & mask:
+                keys[hole], vals[hole] = keys[j], vals[j]
+                hole = j
+            j = (j + 1) & mask
+
+        keys[hole] = _EMPTY
+        vals[hole] = None
+        self._size -= 1
+        return True
 
     def __len__(self) -> int:
         return self._size
@@ -67,58 +125,146 @@ class ChainingHashTable:
 
     def items(self) -> Iterable[Tuple[Any, Any]]:
         """Iterate all (key, value) pairs for reporting/UI."""
-        for bucket in self._buckets:
-            for kv in bucket:
-                yield kv
+        for k, v in zip(self._keys, self._vals):
+            if k is not _EMPTY:
+                yield k, v
+
+    def sorted_items(self) -> Tuple[Tuple[Any, Any], ...]:
+        """
+        All (key, value) pairs in key order; sorted once, then reused until the table changes.
+        Cached as a tuple so a caller cannot reorder or resize the shared copy.
+        """
+        if self._sorted is None:
+            self._sorted = tuple(sorted(self.items(), key=lambda kv: kv[0]))
+        return self._sorted
 
     def capacity(self) -> int:
-        return len(self._buckets)
+        return self._cap
 
     def load_factor(self) -> float:
-        return self._size / len(self._buckets)
+        return self._size / self._cap
 
-    def _index(self, key: Any) -> int:
-        # Built-in hash % capacity routes key to a bucket
-        return hash(key) % len(self._buckets)
+    def _find(self, key: Any) -> int:
+        """Slot holding key, or -1. Probing stops at the first empty slot."""
+        keys = self._keys
+        mask = self._mask
+        # Power-of-two capacity: masking the built-in hash picks the home slot (AND, not %)
+        idx = hash(key) & mask
+        while keys[idx] is not _EMPTY:
+            if keys[idx] == key:
+                return idx
+            idx = (idx + 1) & mask
+        return -1
 
     def _resize(self, new_capacity: int) -> None:
-        """Rehash all entries into a larger bucket array to maintain O(1) average ops."""
-        old_buckets = self._buckets
-        self._buckets = [[] for _ in range(new_capacity)]
+        """Re-probe all entries into a larger slot array to maintain O(1) average ops."""
+        old = list(self.items())
         self._size = 0
-        for bucket in old_buckets:
-            for k, v in bucket:
-                idx = hash(k) % new_capacity
-                self._buckets[idx].append((k, v))
-                self._size += 1
+        new_capacity = 1 << (new_capacity - 1).bit_length()
+        self._keys = [_EMPTY] * new_capacity
+        self._vals = [None] * new_capacity
+        self._cap = new_capacity
+        self._mask = mask = new_capacity - 1
+        for k, v in old:
+            idx = hash(k) & mask
+            while self._keys[idx] is not _EMPTY:
+                idx = (idx + 1) & mask
+            self._keys[idx] = k
+            self._vals[idx] = v
+            self._size += 1
 
-    def print_table(self):
-        rows = []
-        for bucket in self._buckets:
-            for key, value in bucket:
-                rows.append([
-                    str(key),
-                    f"{value.street}, {value.city}, {value.state} {value.zip}",
-                    str(value.deadline),
-                    str(value.weight),
-                    str(value.status),
-                    str(value.delivery_time)
-                ])
-        col_widths = [max(
-            len(row[i]) for row in rows + [["Package ID", "Address", "Deadline", "Weight", "Status", "Delivery Time"]])
-                      for i in range(6)]
-        header = ["Package ID", "Address", "Deadline", "Weight", "Status", "Delivery Time"]
-        print("  ".join(header[i].ljust(col_widths[i]) for i in range(6)))
-        print("-" * (sum(col_widths) + 10))
-        for row in rows:
-            print("  ".join(row[i].ljust(col_widths[i]) for i in range(6)))
+
+class IntKeyTable(_TableReport):
+    """
+    - Direct-address table for package storage: slot k holds the Package with ID k.
+    - Identity hash over small non-negative int keys, so there are no collisions and no
+      probing; insert/search/remove are a single list index.
+    - Grows (at least doubling) when a key lands past the end of the slot list.
+    - Empty slots hold None (values may not be None), so search() is a bounds check and
+      one list index with no sentinel compare.
+
+    - insert(): place/update value at slot key
+    - search(): return value for key or None
+    - remove(): clear slot key if occupied
+    - items(): iterate occupied slots in key order
+    - sorted_items(): same as items(); the slot list is already sorted
+    - print_table(): pretty-prints core package fields for screenshots
+    """
+
+    __slots__ = ("_slots", "_size")
+
+    def __init__(self, init_capacity: int = 64) -> None:
+        if init_capacity < 1:
+            raise ValueError("init_capacity must be >= 1")
+        self._slots: List[Any] = [None] * init_capacity
+        self._size: int = 0
+
+    def insert(self, key: int, value: Any) -> None:
+        """Insert or update value at slot key; grows to max(2x, key + 1) slots when key is past the end."""
+        if key < 0:
+            raise ValueError("IntKeyTable keys must be non-negative")
+        if value is None:
+            raise ValueError("IntKeyTable values must not be None")
+        slots = self._slots
+        if key >= len(slots):
+            slots.extend([None] * max(len(slots), key + 1 - len(slots)))
+        if slots[key] is None:
+            self._size += 1
+        slots[key] = value
+
+    def search(self, key: int) -> Optional[Any]:
+        """Return value for key, or None if absent."""
+        slots = self._slots
+        if 0 <= key < len(slots):
+            return slots[key]
+        return None
+
+    def remove(self, key: int) -> bool:
+        """Clear slot key. Returns True if removed, False if not found."""
+        slots = self._slots
+        if 0 <= key < len(slots) and slots[key] is not None:
+            slots[key] = None
+            self._size -= 1
+            return True
+        return False
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, key: int) -> bool:
+        return self.search(key) is not None
+
+    def items(self) -> Iterable[Tuple[int, Any]]:
+        """Iterate all (key, value) pairs in ascending key order."""
+        for k, v in enumerate(self._slots):
+            if v is not None:
+                yield k, v
+
+    def sorted_items(self) -> Iterable[Tuple[int, Any]]:
+        """Key-ordered pairs for free: slot k holds key k."""
+        return self.items()
+
+    def capacity(self) -> int:
+        return len(self._slots)
+
+
+# Original public name of the open-addressing table, kept for existing imports
+ChainingHashTable = HashTable
+
+# Either table can back the package store; routing/simulation only use the shared API
+PackageTable = Union[HashTable, IntKeyTable]
 
 if __name__ == "__main__":
     # Small smoke test for local debugging
-    ht = ChainingHashTable()
+    ht = HashTable()
     ht.insert(1, "Package 1")
     ht.insert(2, "Package 2")
     print("Search 1:", ht.search(1))
     print("Search 2:", ht.search(2))
     ht.remove(1)
     print("After remove, search 1:", ht.search(1))
+
+    dt = IntKeyTable(init_capacity=2)
+    dt.insert(1, "Package 1")
+    dt.insert(40, "Package 40")
+    print("Direct search 40:", dt.search(40), "| capacity", dt.capacity())
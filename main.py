@@ -2,23 +2,28 @@
 # Student ID: 012594297
 # Class: Data Structures and Algorithms II
 
-from hash_table import ChainingHashTable
-import csv
+from hash_table import IntKeyTable, PackageTable
+from bisect import bisect_right
 from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 from distances import AddressIndex, DistanceMatrix
 from router import Truck, route_truck
-from datetime import timedelta, datetime, time
+from datetime import timedelta
 from simulator import simulate_day, print_summary
+import csv
 import re
+import sys
 
 
 
 # ----- Models -----
-@dataclass
+@dataclass(slots=True)
 class Package:
     """
     Represents a single WGUPS package and all fields the UI must display.
+    Slotted: no per-instance __dict__, and attribute reads are fixed-offset slot loads.
+    All *_time fields are int seconds since midnight; fmt_time()/fmt_deadline() render them.
     """
     id: int
     street: str
@@ -29,36 +34,97 @@ class Package:
     weight: str
     notes: str
     status: str = "At the hub"
-    deadline_time: Optional[time] = None
-    departure_time: Optional[timedelta] = None
-    delivery_time: Optional[timedelta] = None
+    deadline_time: Optional[int] = None
+    departure_time: Optional[int] = None
+    delivery_time: Optional[int] = None
     truck_id: Optional[int] = None
-    available_time: timedelta = timedelta(hours=0)
-    correction_time: Optional[timedelta] = None
+    available_time: int = 0
+    correction_time: Optional[int] = None
     corrected_street: Optional[str] = None
+    node_id: Optional[int] = None
+    corrected_node_id: Optional[int] = None
 
 
 # ----- Data store -----
-packages = ChainingHashTable(init_capacity=64)
+packages = IntKeyTable(init_capacity=64)
 
 # ----- Loaders -----
-def _parse_deadline(s: str) -> Optional[time]:
+def _to_seconds(td: timedelta) -> int:
+    # timedelta -> int seconds since midnight, for the few places that start from a timedelta
+    return int(td.total_seconds())
+
+def _parse_deadline(s: str) -> Optional[int]:
     s = (s or "").strip()
     if not s or s.upper() == "EOD":
         return None
-    return datetime.strptime(s, "%I:%M %p").time()
-
-# Soft pattern to extract "HH:MM"
-_TIME_RE = re.compile(r'(\d{1,2}:\d{2})\s*([AaPp][Mm])?')
-
-def _parse_hhmm_from_text(text: str) -> Optional[time]:
-    m = _TIME_RE.search(text)
-    if not m:
-        return None
-    hhmm, ampm = m.group(1), m.group(2)
+    return _parse_clock(s)
+
+# One pass over a Notes cell finds everything _infer_constraints needs: the "delay" and
+# address-correction keywords, the first "H:MM [AM|PM]" and the text after the first word
+# "to". The "to" branch is a lookahead, so the scan keeps going and still finds a later
+# time (e.g. "...will not arrive to depot until 9:05 am").
+_NOTE_RE = re.compile(
+    r"""
+    (?P<delay>delay)                                                  # delayed arrival
+    | (?P<fix>wrong\ address|address\ corrected|corrected\ at)        # address correction
+    | (?P<hhmm>\d{1,2}:\d{2})\s*(?P<ampm>[AP]M)?                       # clock time, optional meridiem
+    | \bto\b(?=\s*(?P<dest>.+)$)                                      # destination named after "to"
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+def _parse_clock(s: str) -> int:
+    """
+    Hand-rolled parser for the two clock formats used here, "H:MM AM/PM" (12-hour) and
+    "H:MM" (24-hour), returning seconds since midnight. Accepts what strptime's
+    "%I:%M %p" / "%H:%M" did (whitespace required before AM/PM), except that only ASCII
+    digits count, without its per-call format interpretation; invalid input still raises
+    ValueError.
+    """
+    hh, sep, rest = s.strip().partition(":")
+    width = 2 if _is_digits(rest[1:2]) else 1
+    mm, tail = rest[:width], rest[width:]
+    if not (sep and len(hh) <= 2 and _is_digits(hh) and _is_digits(mm)):
+        raise ValueError(f"time data {s!r} is not H:MM [AM|PM]")
+    if tail and not tail[0].isspace():
+        raise ValueError(f"time data {s!r} needs a space before AM/PM")
+    ampm = tail.strip().upper()
+    h, m = int(hh), int(mm)
     if ampm:
-        return datetime.strptime(f"{hhmm} {ampm.upper()}", "%I:%M %p").time()
-    return datetime.strptime(hhmm, "%H:%M").time()
+        if ampm not in ("AM", "PM") or not 1 <= h <= 12:
+            raise ValueError(f"time data {s!r} is not a valid 12-hour time")
+        h = h % 12 + (12 if ampm == "PM" else 0)
+    elif h > 23:
+        raise ValueError(f"time data {s!r} is not a valid 24-hour time")
+    if m > 59:
+        raise ValueError(f"time data {s!r} has minutes out of range")
+    return h * 3600 + m * 60
+
+def _is_digits(s: str) -> bool:
+    # str.isdigit() alone also accepts non-ASCII digits such as "\u0663"
+    return s.isascii() and s.isdigit()
+
+def _parse_hhmm(hhmm: str, ampm: Optional[str]) -> int:
+    return _parse_clock(f"{hhmm} {ampm}" if ampm else hhmm)
+
+@lru_cache(maxsize=256)
+def _scan_notes(notes: str) -> Tuple[bool, bool, Optional[int], Optional[str]]:
+    # (delayed, corrected, first time, text after "to"). Cached: the same note text repeats
+    # across packages (e.g. the delayed-flight note)
+    delayed = corrected = False
+    found_time, dest = None, None
+    for m in _NOTE_RE.finditer(notes):
+        kind = m.lastgroup
+        if kind == "delay":
+            delayed = True
+        elif kind == "fix":
+            corrected = True
+        elif kind == "dest":
+            if dest is None:
+                dest = m.group("dest").strip()
+        elif found_time is None:  # a time; lastgroup is "ampm" when a meridiem matched
+            found_time = _parse_hhmm(m.group("hhmm"), m.group("ampm"))
+    return delayed, corrected, found_time, dest
 
 def _infer_constraints(pkg: Package) -> None:
     """
@@ -67,54 +133,65 @@ def _infer_constraints(pkg: Package) -> None:
       - "Delayed on flight—will not arrive to depot until 9:05 am"
       - "Wrong address listed, corrected at 10:20 AM to 410 S State St"
     """
-    note = (pkg.notes or "").strip().lower()
+    if not pkg.notes:
+        return
+    delayed, corrected, t, dest = _scan_notes(pkg.notes)
 
     # Delays: set earliest available_time
-    if "delay" in note:
-        t = _parse_hhmm_from_text(note)
-        if t:
-            pkg.available_time = timedelta(hours=t.hour, minutes=t.minute)
-
-    # Address correction: set correction_time and corrected_street if detectable
-    if "wrong address" in note or "address corrected" in note or "corrected at" in note:
-        t = _parse_hhmm_from_text(note)
-        if t:
-            pkg.correction_time = timedelta(hours=t.hour, minutes=t.minute)
-            pkg.available_time = max(pkg.available_time, pkg.correction_time)
-        if " to " in (pkg.notes or ""):
-            try:
-                pkg.corrected_street = pkg.notes.split(" to ", 1)[1].strip()
-            except Exception:
-                pkg.corrected_street = None
-
-    m = re.search(r"\bto\b\s*(.+)$", pkg.notes or "", flags=re.IGNORECASE)
-    if m:
-        pkg.corrected_street = m.group(1).strip()
+    if delayed and t is not None:
+        pkg.available_time = t
+
+    # Address correction: set correction_time when detectable
+    if corrected and t is not None:
+        pkg.correction_time = t
+        pkg.available_time = max(pkg.available_time, pkg.correction_time)
+
+    # Whatever follows "to" is the corrected street, but only on a correction note
+    # (the delay note's "arrive to depot until 9:05 am" is not an address)
+    if corrected and dest is not None:
+        pkg.corrected_street = dest
+
+def _resolve_nodes(pkg: Package, index: AddressIndex) -> None:
+    # Street -> matrix node once per package, so routing never hashes address strings
+    pkg.node_id = index.node_for(pkg.street)
+    pkg.corrected_node_id = None
+    if pkg.correction_time is not None and pkg.corrected_street:
+        pkg.corrected_node_id = index.node_for(pkg.corrected_street)
 
-def load_packages_csv(path: str) -> None:
+def load_packages_csv(path: str, index: AddressIndex) -> None:
     """
     Read packageCSV.csv and populate the hash table:
-      - parse deadline to time object (or None for EOD)
+      - parse deadline to seconds since midnight (or None for EOD)
       - infer availability/correction from notes
-      - insert into ChainingHashTable keyed by package ID
+      - resolve street (and corrected street) to node IDs
+      - insert into the package table keyed by package ID
     """
-    with open(path, newline="") as f:
-        reader = csv.reader(f)
-        next(reader)
-        for row in reader:
-            pkg = Package(
-                id=int(row[0]),
-                street=row[1],
-                city=row[2],
-                state=row[3],
-                zip=row[4],
-                deadline=row[5],
-                weight=row[6],
-                notes=row[7],
-                deadline_time=_parse_deadline(row[5]),
-            )
-            _infer_constraints(pkg)
-            packages.insert(pkg.id, pkg)
+    with open(path, "rb") as f:
+        lines = f.read().decode().splitlines()[1:]
+    for line in lines:
+        if not line.strip():
+            continue
+        # Unquoted rows take one C-level split; any row with a quoted field (NOTES like
+        # "Must be delivered with 15, 19") goes through csv for correct unquoting
+        if '"' in line:
+            row = next(csv.reader((line,)))
+        else:
+            row = line.split(",", 7)
+        notes = row[7] if len(row) > 7 else ""
+        pkg = Package(
+            id=int(row[0]),
+            street=row[1],
+            city=row[2],
+            state=row[3],
+            zip=row[4],
+            deadline=row[5],
+            weight=row[6],
+            notes=notes,
+            deadline_time=_parse_deadline(row[5]),
+        )
+        _infer_constraints(pkg)
+        _resolve_nodes(pkg, index)
+        packages.insert(pkg.id, pkg)
 
 # ----- Reset Package Status -----
 def reset_package_statuses():
@@ -127,7 +204,7 @@ def reset_package_statuses():
         pkg.delivery_time = None
         pkg.truck_id = None
 
-def apply_scenario_overrides() -> None:
+def apply_scenario_overrides(index: AddressIndex) -> None:
     """
     Encode rubric assumptions explicitly (robust to messy notes):
       - Pkgs 6,25,28,32: not available until 9:05
@@ -136,34 +213,33 @@ def apply_scenario_overrides() -> None:
     for pid in (6, 25, 28, 32):
         p = packages.search(pid)
         if p:
-            p.available_time = timedelta(hours=9, minutes=5)
+            p.available_time = _to_seconds(timedelta(hours=9, minutes=5))
 
     p9 = packages.search(9)
     if p9:
-        p9.correction_time = timedelta(hours=10, minutes=20)
+        p9.correction_time = _to_seconds(timedelta(hours=10, minutes=20))
         p9.available_time = max(p9.available_time, p9.correction_time)
         p9.corrected_street = "410 S State St"
+        _resolve_nodes(p9, index)
 
 
 # ----- Console Helpers -----
-def parse_query_time(s: str) -> timedelta:
-    s = s.strip()
-    if "AM" in s.upper() or "PM" in s.upper():
-        t = datetime.strptime(s.upper(), "%I:%M %p").time()
-    else:
-        t = datetime.strptime(s, "%H:%M").time()
-    return timedelta(hours=t.hour, minutes=t.minute)
-
-def fmt_time(td: Optional[timedelta]) -> str:
-    if td is None:
+def parse_query_time(s: str) -> int:
+    # "9:15 AM" (12-hour) or "13:45" (24-hour) -> seconds since midnight
+    return _parse_clock(s)
+
+def fmt_time(sec: Optional[int]) -> str:
+    # Seconds since midnight -> "HH:MM AM/PM" (same output as strftime("%I:%M %p"))
+    if sec is None:
         return "N/A"
-    return (datetime(2000, 1, 1) + td).strftime("%I:%M %p")
+    h, m = divmod(sec // 60 % 1440, 60)
+    return "{:02d}:{:02d} {}".format(h % 12 or 12, m, "AM" if h < 12 else "PM")
 
-def fmt_deadline(t: Optional[time]) -> str:
-    return t.strftime("%I:%M %p") if t else "EOD"
+def fmt_deadline(sec: Optional[int]) -> str:
+    return fmt_time(sec) if sec is not None else "EOD"
 
 
-def address_at_time(pkg: Package, query: timedelta) -> str:
+def address_at_time(pkg: Package, query: int) -> str:
     """
     Return which address should be shown at a given time:
       - before correction_time: original address
@@ -174,7 +250,7 @@ def address_at_time(pkg: Package, query: timedelta) -> str:
             return pkg.corrected_street
     return pkg.street
 
-def status_at_time(pkg: Package, query: timedelta) -> str:
+def status_at_time(pkg: Package, query: int) -> str:
     if query < pkg.available_time:
         return "DELAYED"
     if pkg.delivery_time and query >= pkg.delivery_time:
@@ -183,17 +259,89 @@ def status_at_time(pkg: Package, query: timedelta) -> str:
         return "En route"
     return "At the hub"
 
+def _timeline(pkg: Package) -> Tuple[List[int], List[Tuple[str, str]]]:
+    """
+    (address, status) of pkg as a step function of the query time. Both helpers above only
+    compare the query against these thresholds with >=, so labels[k] holds for every
+    query in [times[k - 1], times[k]); labels[0] is the state before the first threshold.
+    """
+    times = sorted({
+        t for t in (pkg.available_time, pkg.departure_time, pkg.delivery_time, pkg.correction_time)
+        if t is not None
+    })
+    labels = [(address_at_time(pkg, q), status_at_time(pkg, q)) for q in [-1] + times]
+    return times, labels
+
+
+class StatusColumns:
+    """
+    ID-sorted snapshot of every package's event timeline, for the console menus.
+    Process/Flow:
+      - __init__(): after a simulation, build each package's breakpoints and labels once
+        with _timeline(), plus the labels that do not depend on the query
+      - at(): (address, status) of one package, one bisect over its breakpoints
+      - rows_at(): (pid, truck, address, deadline, status) for every package
+      - report_at(): the formatted menu text built from rows_at()
+    rows_at() and report_at() are memoized per query minute: the snapshot is rebuilt after
+    every simulation, so it never goes stale.
+    """
+    __slots__ = ("pids", "trucks", "deadlines", "times", "labels", "_pos", "_memo", "_reports")
+
+    def __init__(self, table: PackageTable) -> None:
+        pkgs = [pkg for _, pkg in table.sorted_items()]
+        self.pids: List[int] = [p.id for p in pkgs]
+        self.trucks: List[str] = [str(p.truck_id) if p.truck_id else "N/A" for p in pkgs]
+        self.deadlines: List[str] = [fmt_deadline(p.deadline_time) for p in pkgs]
+        timelines = [_timeline(p) for p in pkgs]
+        self.times: List[List[int]] = [t for t, _ in timelines]
+        self.labels: List[List[Tuple[str, str]]] = [l for _, l in timelines]
+        self._pos: Dict[int, int] = {pid: i for i, pid in enumerate(self.pids)}
+        self._memo: Dict[int, List[Tuple[int, str, str, str, str]]] = {}
+        self._reports: Dict[int, str] = {}
+
+    def at(self, pid: int, q: int) -> Optional[Tuple[str, str]]:
+        """(address, status) of package pid at the minute of q, or None for an unknown ID."""
+        i = self._pos.get(pid)
+        if i is None:
+            return None
+        return self.labels[i][bisect_right(self.times[i], q // 60 * 60)]
+
+    def rows_at(self, q: int) -> List[Tuple[int, str, str, str, str]]:
+        """(pid, truck, address, deadline, status) for every package at query time q."""
+        key = q // 60
+        rows = self._memo.get(key)
+        if rows is None:
+            q = key * 60
+            rows = self._memo[key] = []
+            for pid, truck, deadline, times, labels in zip(
+                    self.pids, self.trucks, self.deadlines, self.times, self.labels):
+                addr, status = labels[bisect_right(times, q)]
+                rows.append((pid, truck, addr, deadline, status))
+        return rows
+
+    def report_at(self, q: int) -> str:
+        """Menu option 2 text at query time q, one line per package (memoized per minute)."""
+        key = q // 60
+        text = self._reports.get(key)
+        if text is None:
+            lines = [
+                f"Package {pid} | Truck {truck} | {addr} | Deadline {deadline} | {status}\n"
+                for pid, truck, addr, deadline, status in self.rows_at(q)
+            ]
+            text = self._reports[key] = "".join(lines)
+        return text
+
 # ----- Main -----
 def main():
-    # 1) Load packages to hash table
-    load_packages_csv("data/packageCSV.csv")
-    print("\nHash Table Contents:")
-    packages.print_table()
-
-    # 2) Load address index and distances
+    # 1) Load address index and distances
     index = load_address_index("data/addressCSV.csv")
     matrix = load_distance_matrix("data/distanceCSV.csv")
 
+    # 2) Load packages to hash table, resolving each street to its node ID
+    load_packages_csv("data/packageCSV.csv", index)
+    print("\nHash Table Contents:")
+    packages.print_table()
+
     # 3) Manual staging
     loads = {
         1: [1, 29, 7, 30, 8, 34, 40, 14, 15, 16, 19, 20, 13, 37, 31],
@@ -209,9 +357,10 @@ def main():
 
     # 4) Reset, apply scenario assumptions, then simulate full day
     reset_package_statuses()
-    apply_scenario_overrides()
+    apply_scenario_overrides(index)
     result = simulate_day(packages, index, matrix, loads, holds)
     print_summary(result)
+    columns = StatusColumns(packages)
 
     # 5) Interactive console
     while True:
@@ -231,20 +380,19 @@ def main():
                     continue
                 print(f"Package {pid} | Truck {pkg.truck_id if pkg.truck_id else 'N/A'}")
                 print(f"Deadline: {fmt_deadline(pkg.deadline_time)}")
-                print(f"Address at {fmt_time(q)}: {address_at_time(pkg, q)}")
-                print(f"Status at {fmt_time(q)}: {status_at_time(pkg, q)}")
+                addr, status = columns.at(pid, q)
+                print(f"Address at {fmt_time(q)}: {addr}")
+                print(f"Status at {fmt_time(q)}: {status}")
                 print(f"Actual delivery time: {fmt_time(pkg.delivery_time)}")
             except Exception as e:
                 print("Error:", e)
         elif choice == "2":
             try:
                 q = parse_query_time(input("Enter time (e.g., 9:15 AM or 13:45): "))
-                for pid, pkg in sorted(packages.items(), key=lambda kv: kv[0]):
-                    addr = address_at_time(pkg, q)
-                    status = status_at_time(pkg, q)
-                    truck = pkg.truck_id if pkg.truck_id else "N/A"
-                    deadline = fmt_deadline(pkg.deadline_time)
-                    print(f"Package {pid} | Truck {truck} | {addr} | Deadline {deadline} | {status}")
+                # The whole report is one string per query minute, handed to stdout in one write
+                report = columns.report_at(q)
+                if report:
+                    sys.stdout.write(report)
             except Exception as e:
                 print("Error:", e)
         elif choice == "3":
@@ -1,15 +1,21 @@
 # Author: Jedi Lee
 # Student ID: 012594297
 
+import heapq
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta, time
-from typing import List, Tuple, Optional
-from hash_table import ChainingHashTable
+from typing import Any, Dict, List, Tuple, Optional
+from hash_table import PackageTable
 from distances import AddressIndex, DistanceMatrix
+from _router_kernels import Candidate, pick_nearest, pick_next
 
 HUB_ADDR = "4001 South 700 East"
+# Planning speed used to judge deadlines while picking the next stop (matches Truck.speed_mph)
+PLAN_SPEED_MPH = 18.0
+SECS_PER_MILE = 3600.0 / PLAN_SPEED_MPH
+# Slack under which an on-time package is treated as urgent
+URGENCY_S = 15 * 60
 
-@dataclass
+@dataclass(slots=True)
 class Truck:
     """
     A minimal truck state used by the greedy router.
@@ -21,91 +27,223 @@ class Truck:
       - clock:          simulated time-of-day
       - miles:          miles accrued so far
       - load:           package IDs loaded for this run
+    Times are int seconds since midnight, like the Package time fields.
     """
     id: int
     speed_mph: float = 18.0
     capacity: int = 16
-    start_time: timedelta = timedelta(hours=8)
+    start_time: int = 8 * 3600
     current_addr: str = HUB_ADDR
-    clock: timedelta = timedelta(hours=8)
+    clock: int = 8 * 3600
     miles: float = 0.0
     load: List[int] = field(default_factory=list)
 
-def travel_time(miles: float, mph: float) -> timedelta:
-    # Convert miles and mph to travel duration
-    return timedelta(hours=miles / mph) if mph > 0 else timedelta(0)
+def travel_time(miles: float, mph: float) -> int:
+    # Convert miles and mph to travel duration in whole seconds. The per-stop loops in
+    # _schedule and route_truck inline this same expression; keep them in step if it changes.
+    return round(miles / mph * 3600) if mph > 0 else 0
 
-def _would_miss_deadline(current_clock: timedelta, travel_hours: float, deadline: Optional[time]) -> bool:
+def _candidates(pkg_objs: List[Any]) -> List[Candidate]:
+    # Per-package routing facts, materialized once per route so the nearest-neighbor scan
+    # reads plain tuple fields instead of probing Package attributes per candidate. A
+    # corrected node only counts when it has a correction time to take effect at.
+    return [
+        (
+            pos,
+            pkg.node_id,
+            pkg.corrected_node_id if pkg.correction_time is not None else None,
+            pkg.available_time,
+            pkg.correction_time,
+            pkg.deadline_time,
+            pkg,
+        )
+        for pos, pkg in enumerate(pkg_objs)
+    ]
+
+def _nearest_next(
+    current_node: int,
+    current_clock: int,
+    cand: List[Candidate],
+    deadlined: int,
+    matrix: DistanceMatrix,
+) -> Tuple[int, Optional[int], Optional[Any], float]:
     """
-    Helper: determine if arrival would be later than a package's deadline.
-    We anchor both to the same base date for comparison.
+    Pick the next stop among cand: an urgent deadline first, else the nearest on-time
+    package, else the nearest available one. deadlined counts the candidates that still
+    carry a deadline. Returns (index into cand, pid, package, miles), or
+    (-1, None, None, 0.0) if nothing is available yet.
     """
-    if deadline is None:
-        return False
-    base = datetime(2000, 1, 1)
-    arrival_dt = base + current_clock + timedelta(hours=travel_hours)
-    deadline_dt = datetime.combine(base.date(), deadline)
-    return arrival_dt > deadline_dt
+    # One row of the matrix covers every candidate from the current stop
+    row = matrix.row(current_node)
+    if deadlined:
+        i, d = pick_next(current_clock, row, cand, SECS_PER_MILE, URGENCY_S)
+    else:
+        # Only EOD packages left: urgent and on-time collapse into the nearest available
+        i, d = pick_nearest(current_clock, row, cand)
+    if i < 0:
+        return -1, None, None, 0.0
+    pkg = cand[i][6]
+    return i, pkg.id, pkg, d
 
-def _nearest_next(
-    current_addr: str,
-    current_clock: timedelta,
-    remaining_pkg_ids: List[int],
-    packages: ChainingHashTable,
-    index: AddressIndex,
+
+# Finished routes, keyed by everything the greedy loop reads: the load's routing facts in
+# load order (ties break by position), start time, speed, hub node and the matrix with its
+# load generation (an in-place load() changes the miles behind the same object). The value
+# keeps the matrix next to the record so a recycled id() never replays a different matrix.
+# Record: ([(position, departed at or None, delivered at, leg miles)], back-to-hub miles,
+# final clock, final address).
+_ROUTE_CACHE: Dict[tuple, Tuple[DistanceMatrix, tuple]] = {}
+_ROUTE_CACHE_MAX = 64
+
+def _route_key(truck: Truck, pkg_objs: List[Any], hub_node: int, matrix: DistanceMatrix) -> tuple:
+    facts = tuple(
+        (p.id, p.node_id, p.corrected_node_id, p.available_time, p.correction_time,
+         p.deadline_time, p.departure_time is None)
+        for p in pkg_objs
+    )
+    return facts, truck.start_time, truck.speed_mph, hub_node, id(matrix), matrix.generation
+
+def _replay(truck: Truck, pkg_objs: List[Any], record: tuple) -> None:
+    # Same stamps, in the same order, as the greedy loop that produced the record
+    steps, back, truck.clock, truck.current_addr = record
+    for i, departed, delivered, leg in steps:
+        pkg = pkg_objs[i]
+        if departed is not None:
+            pkg.departure_time = departed
+            pkg.status = "En route"
+        truck.miles += leg
+        pkg.delivery_time = delivered
+        pkg.status = "Delivered"
+    if back is not None:
+        truck.miles += back
+
+def _schedule(
+    truck: Truck,
+    pkg_objs: List[Any],
+    tour: List[int],
+    fresh: List[bool],
+    hub_node: int,
+    matrix: DistanceMatrix,
+) -> Tuple[tuple, float, set]:
+    """
+    Drive a fixed tour (load positions, in order) by the same rules as the greedy loop: wait
+    for a package that is not available yet, aim for its corrected node once the correction
+    time has passed, then return to the hub. fresh[pos] is True when that package had no
+    departure stamp before routing. Nothing is mutated.
+    Returns (record for _replay, total miles, positions delivered after their deadline).
+    """
+    clock, node, speed = truck.start_time, hub_node, truck.speed_mph
+    steps = []
+    miles = 0.0
+    late = set()
+    for pos in tour:
+        pkg = pkg_objs[pos]
+        if clock < pkg.available_time:
+            clock = pkg.available_time
+        departed = clock if fresh[pos] else None
+        corr_time, corr_node = pkg.correction_time, pkg.corrected_node_id
+        target = pkg.node_id
+        if corr_node is not None and corr_time is not None and clock >= corr_time:
+            target = corr_node
+        d = matrix.row(node)[target]
+        miles += d
+        clock += round(d / speed * 3600) if speed > 0 else 0
+        addr, node = pkg.street, pkg.node_id
+        if corr_time is not None and corr_node is not None and clock >= corr_time:
+            addr, node = pkg.corrected_street, corr_node
+        if pkg.deadline_time is not None and clock > pkg.deadline_time:
+            late.add(pos)
+        steps.append((pos, departed, clock, d))
+    back = None
+    if node != hub_node:
+        back = matrix.row(node)[hub_node]
+        miles += back
+        clock += travel_time(back, speed)
+        addr = HUB_ADDR
+    return (steps, back, clock, addr), miles, late
+
+def _two_opt(
+    truck: Truck,
+    pkg_objs: List[Any],
+    steps: List[tuple],
+    hub_node: int,
     matrix: DistanceMatrix,
-) -> Tuple[Optional[int], float]:
-    URGENCY = timedelta(minutes=15)
-    urgent_pick = None
-    urgent_dist = float("inf")
-    best_on_pid, best_on_dist = None, float("inf")
-    best_any_pid, best_any_dist = None, float("inf")
-
-    for pid in remaining_pkg_ids:
-        pkg = packages.search(pid)
-        if not pkg:
-            continue
-        if current_clock < getattr(pkg, "available_time", timedelta(0)):
-            continue
-
-        addr = pkg.street
-        corr_time = getattr(pkg, "correction_time", None)
-        corr_street = getattr(pkg, "corrected_street", None)
-        if corr_time is not None and corr_street and current_clock >= corr_time:
-            addr = corr_street
-
-        d = matrix.distance_between_addresses(current_addr, addr, index)
-        travel_hours = d / 18.0
-
-        if d < best_any_dist:
-            best_any_pid, best_any_dist = pid, d
-
-        if not _would_miss_deadline(current_clock, travel_hours, pkg.deadline_time):
-            if d < best_on_dist:
-                best_on_pid, best_on_dist = pid, d
-            if pkg.deadline_time is not None:
-                base = datetime(2000, 1, 1)
-                arrival_dt = base + current_clock + timedelta(hours=travel_hours)
-                deadline_dt = datetime.combine(base.date(), pkg.deadline_time)
-                slack = deadline_dt - arrival_dt
-                if slack <= URGENCY and d < urgent_dist:
-                    urgent_pick, urgent_dist = pid, d
-
-    if urgent_pick is not None:
-        return urgent_pick, urgent_dist
-    if best_on_pid is not None:
-        return best_on_pid, best_on_dist
-    if best_any_pid is not None:
-        return best_any_pid, best_any_dist
-    return None, 0.0
+) -> Optional[tuple]:
+    """
+    2-opt pass over the greedy tour: reverse tour[i..j] whenever that shortens the day
+    without making any package late that the greedy tour delivered on time and without
+    bringing the truck back to the hub later than greedy did (simulate_day starts the next
+    truck off the earliest return, so a later finish can push its deadlines). Candidate
+    reversals are screened with the four-edge mileage delta on the delivery stop nodes, and
+    only the ones that look shorter are re-scheduled in full (waits and corrections make
+    the real effect non-local). Returns the improved record, or None if greedy stands.
+    """
+    EPS = 1e-9
+    tour = [pos for pos, _, _, _ in steps]
+    fresh = [False] * len(pkg_objs)
+    for pos, departed, _, _ in steps:
+        fresh[pos] = departed is not None
+    record, best_miles, allowed_late = _schedule(truck, pkg_objs, tour, fresh, hub_node, matrix)
+    finish = record[2]
+    # Screening block over load positions, gathered once per route: the node each package
+    # ends up delivered at, plus the hub in the extra last slot
+    hub = len(pkg_objs)
+    stops = [
+        pkg.corrected_node_id if pkg.corrected_node_id is not None else pkg.node_id
+        for pkg in pkg_objs
+    ] + [hub_node]
+    local = [list(map(matrix.row(a).__getitem__, stops)) for a in stops]
+
+    n = len(tour)
+    improved, found = True, False
+    while improved:
+        improved = False
+        seq = [hub] + tour + [hub]
+        for i in range(n - 1):
+            a, b = seq[i], seq[i + 1]
+            row_a, row_b = local[a], local[b]
+            for j in range(i + 1, n):
+                c, e = seq[j + 1], seq[j + 2]
+                if row_a[c] + row_b[e] - row_a[b] - local[c][e] >= -EPS:
+                    continue
+                cand = tour[:i] + tour[i:j + 1][::-1] + tour[j + 1:]
+                cand_rec, miles, late = _schedule(truck, pkg_objs, cand, fresh, hub_node, matrix)
+                if miles < best_miles - EPS and late <= allowed_late and cand_rec[2] <= finish:
+                    tour, record, best_miles = cand, cand_rec, miles
+                    improved = found = True
+                    break
+            if improved:
+                break
+    return record if found else None
+
+@dataclass(frozen=True)
+class RouterContext:
+    """
+    Routing inputs resolved once per simulated day and shared by every truck:
+      - index:     the AddressIndex hub_node was resolved against
+      - matrix:    the distance matrix all routes read
+      - hub_node:  node ID of HUB_ADDR (its row is gathered up front; every route starts
+                   and ends there)
+    """
+    index: AddressIndex
+    matrix: DistanceMatrix
+    hub_node: int
+
+    @classmethod
+    def build(cls, index: AddressIndex, matrix: DistanceMatrix) -> "RouterContext":
+        hub_node = index.node_for(HUB_ADDR)
+        matrix.row(hub_node)
+        return cls(index, matrix, hub_node)
 
 
 def route_truck(
     truck: Truck,
     pkg_ids: List[int],
-    packages: ChainingHashTable,
+    packages: PackageTable,
     index: AddressIndex,
     matrix: DistanceMatrix,
+    two_opt: bool = True,
+    ctx: Optional[RouterContext] = None,
 ) -> None:
     """
     Greedy nearest-neighbor loop:
@@ -115,71 +253,112 @@ def route_truck(
             - pick nearest feasible next stop
             - advance miles & time; mark package delivered
       4) Return to HUB and finish.
+      5) With two_opt, improve the finished tour by 2-opt (see _two_opt) and restamp it.
 
     This respects: capacity, delayed availability, address correction time, and deadlines.
+    A load already routed with the same inputs is replayed from _ROUTE_CACHE instead.
+    ctx is the day's shared RouterContext; built here when not given, or when it was built
+    for another index or matrix.
     """
     # Load packages and set the clock to start_time
     truck.load = pkg_ids[: truck.capacity]
     truck.clock = truck.start_time
     truck.current_addr = HUB_ADDR
+    if ctx is None or ctx.index is not index or ctx.matrix is not matrix:
+        ctx = RouterContext.build(index, matrix)
+    hub_node = ctx.hub_node
+    cur_node = hub_node
+
+    # The only table probes of the route: one per loaded ID (unknown IDs are skipped)
+    pkg_objs = [pkg for pkg in map(packages.search, truck.load) if pkg]
+
+    # Tag every loaded package with this truck
+    for pkg in pkg_objs:
+        pkg.truck_id = truck.id
+        # Packages whose node IDs were never resolved (or that gained a correction after
+        # loading) are resolved here once, so the routing loop below only ever sees ints
+        if pkg.node_id is None:
+            pkg.node_id = index.node_for(pkg.street)
+        if (pkg.corrected_node_id is None and pkg.correction_time is not None
+                and pkg.corrected_street):
+            pkg.corrected_node_id = index.node_for(pkg.corrected_street)
 
-    # Tag initial 'En route' for any packages immediately available at departure
-    for pid in truck.load:
-        pkg = packages.search(pid)
-        if pkg:
-            pkg.truck_id = truck.id
+    # Identical inputs give an identical route, so replay it instead of re-routing
+    key = _route_key(truck, pkg_objs, hub_node, matrix), two_opt
+    hit = _ROUTE_CACHE.get(key)
+    if hit is not None and hit[0] is matrix:
+        _replay(truck, pkg_objs, hit[1])
+        return
+    steps = []
+    back = None
+    miles_before = truck.miles
 
-    remaining = truck.load.copy()
+    remaining = _candidates(pkg_objs)
+    # Candidates that still carry a deadline; zero selects the deadline-free kernel
+    deadlined = sum(c[5] is not None for c in remaining)
 
-    # Main routing loop
+    # Future availability/correction times as a min-heap; the wait branch pops past ones
+    # instead of rescanning every remaining package
+    events = [t for c in remaining for t in (c[3], c[4]) if t is not None and t > truck.clock]
+    heapq.heapify(events)
+
+    # Main routing loop. Per-stop travel time is travel_time() written out inline.
+    speed = truck.speed_mph
     while remaining:
-        next_pid, dist = _nearest_next(truck.current_addr, truck.clock, remaining, packages, index, matrix)
+        idx, next_pid, pkg, dist = _nearest_next(cur_node, truck.clock, remaining, deadlined, matrix)
 
         # If we identified a next package that is just now becoming available, mark its depart time
-        pkg = packages.search(next_pid)
-        if pkg and pkg.departure_time is None and truck.clock >= getattr(pkg, "available_time", timedelta(0)):
-            pkg.departure_time = truck.clock
+        departed = None
+        if pkg and pkg.departure_time is None and truck.clock >= pkg.available_time:
+            pkg.departure_time = departed = truck.clock
             pkg.status = "En route"
 
         # No feasible next stop — break to avoid infinite loop
         if next_pid is None:
-            # find next availability or correction time in the future
-            next_events = []
-            for pid in remaining:
-                pkg = packages.search(pid)
-                if not pkg:
-                    continue
-                avail = getattr(pkg, "available_time", None)
-                if avail is not None and avail > truck.clock:
-                    next_events.append(avail)
-                corr_t = getattr(pkg, "correction_time", None)
-                if corr_t is not None and corr_t > truck.clock:
-                    next_events.append(corr_t)
-            if next_events:
-                truck.clock = min(next_events)
+            # Wait for the next availability or correction time in the future. Nothing being
+            # available means every remaining package is still pending, so any event still in
+            # the heap past the clock belongs to one of them.
+            while events and events[0] <= truck.clock:
+                heapq.heappop(events)
+            if events:
+                truck.clock = heapq.heappop(events)
                 continue
             else:
                 break
         # Travel to next stop
         truck.miles += dist
-        truck.clock += travel_time(dist, truck.speed_mph)
+        truck.clock += round(dist / speed * 3600) if speed > 0 else 0
 
         # Deliver and stamp delivery time and final address
-        pkg = packages.search(next_pid)
-        if pkg:
-            addr = pkg.street
-            corr_time = getattr(pkg, "correction_time", None)
-            corr_street = getattr(pkg, "corrected_street", None)
-            if corr_time is not None and corr_street and truck.clock >= corr_time:
-                addr = corr_street
-            truck.current_addr = addr
-            pkg.delivery_time = truck.clock
-            pkg.status = "Delivered"
-        remaining.remove(next_pid)
+        addr, cur_node = pkg.street, pkg.node_id
+        corr_time, corr_node = pkg.correction_time, pkg.corrected_node_id
+        if corr_time is not None and corr_node is not None and truck.clock >= corr_time:
+            addr, cur_node = pkg.corrected_street, corr_node
+        truck.current_addr = addr
+        pkg.delivery_time = truck.clock
+        pkg.status = "Delivered"
+        # list.pop(idx) keeps load order; a swap-with-last pop would change which of two
+        # equally near packages (e.g. the same address) wins the tie
+        done = remaining.pop(idx)
+        if done[5] is not None:
+            deadlined -= 1
+        steps.append((done[0], departed, truck.clock, dist))
 
     # Return to hub after finishing last stop
-    if truck.current_addr != HUB_ADDR:
-        back = matrix.distance_between_addresses(truck.current_addr, HUB_ADDR, index)
+    if cur_node != hub_node:
+        back = matrix.row(cur_node)[hub_node]
         truck.miles += back
-        truck.clock += travel_time(back, truck.speed_mph)
+        truck.clock += travel_time(back, speed)
         truck.current_addr = HUB_ADDR
+
+    record = (steps, back, truck.clock, truck.current_addr)
+    if two_opt and len(steps) == len(pkg_objs) > 2:
+        better = _two_opt(truck, pkg_objs, steps, hub_node, matrix)
+        if better is not None:
+            truck.miles = miles_before
+            _replay(truck, pkg_objs, better)
+            record = better
+
+    if len(_ROUTE_CACHE) >= _ROUTE_CACHE_MAX:
+        _ROUTE_CACHE.clear()
+    _ROUTE_CACHE[key] = (matrix, record)
@@ -3,14 +3,14 @@
 
 from datetime import timedelta
 from typing import Dict, List
-from hash_table import ChainingHashTable
-from router import Truck, route_truck
+from hash_table import PackageTable
+from router import RouterContext, Truck, route_truck
 from distances import AddressIndex, DistanceMatrix
 
-HUB_START = timedelta(hours=8)
+HUB_START = 8 * 3600  # seconds since midnight
 
 def simulate_day(
-    packages: ChainingHashTable,
+    packages: PackageTable,
     index: AddressIndex,
     matrix: DistanceMatrix,
     loads: Dict[int, List[int]],
@@ -18,7 +18,7 @@ def simulate_day(
 ) -> Dict:
     """
       1) Create 3 Truck objects
-      2) Apply any per-truck hold overrides
+      2) Apply any per-truck hold overrides (timedelta at this boundary, seconds inside)
       3) Route Truck 1 and Truck 2 immediately
       4) When a driver is free, start Truck 3 if needed.
       5) Return total mileage and the truck objects for reporting.
@@ -31,14 +31,18 @@ def simulate_day(
     if hold_at_hub_until:
         for tid, ts in hold_at_hub_until.items():
             if tid in trucks:
-                trucks[tid].start_time = ts
-                trucks[tid].clock = ts
+                trucks[tid].start_time = int(ts.total_seconds())
+                trucks[tid].clock = trucks[tid].start_time
 
-    # Two drivers active: run 1 and 2 in parallel
+    # Hub node and its row are resolved once and shared by all three routes
+    ctx = RouterContext.build(index, matrix)
+
+    # Two drivers active: trucks 1 and 2 share the morning on the clock, but their routes
+    # are independent, so they are computed one after the other
     if 1 in loads and loads[1]:
-        route_truck(t1, loads[1], packages, index, matrix)
+        route_truck(t1, loads[1], packages, index, matrix, ctx=ctx)
     if 2 in loads and loads[2]:
-        route_truck(t2, loads[2], packages, index, matrix)
+        route_truck(t2, loads[2], packages, index, matrix, ctx=ctx)
 
     # Truck 3 waits until one driver returns
     if 3 in loads and loads[3]:
@@ -46,7 +50,7 @@ def simulate_day(
         if t3.start_time < driver_free_time:
             t3.start_time = driver_free_time
             t3.clock = driver_free_time
-        route_truck(t3, loads[3], packages, index, matrix)
+        route_truck(t3, loads[3], packages, index, matrix, ctx=ctx)
     total_miles = sum(tr.miles for tr in trucks.values())
     return {"trucks": trucks, "total_miles": total_miles}
 
@@ -58,5 +62,5 @@ def print_summary(sim_result: Dict) -> None:
     trucks = sim_result["trucks"]
     total = sim_result["total_miles"]
     for tid, tr in trucks.items():
-        print(f"Truck {tid}: miles={tr.miles:.1f}, finished at {tr.clock}")
+        print(f"Truck {tid}: miles={tr.miles:.1f}, finished at {timedelta(seconds=tr.clock)}")
     print(f"TOTAL MILES: {total:.1f}")